@@ -1,6 +1,5 @@
 import PyInstaller.__main__
 import os
-import sys
 
 def build():
     # Get the absolute path of the script directory
@@ -14,7 +13,8 @@ def build():
     # Create icon if it doesn't exist
     if not os.path.exists(icon_path):
         print("Creating icon...")
-        os.system(f"{sys.executable} create_icon.py")
+        from create_icon import make_icon
+        make_icon(icon_path)
     
     # Define PyInstaller arguments
     args = [
@@ -29,6 +29,7 @@ def build():
         '--hidden-import=sounddevice',
         '--hidden-import=soundfile',
         '--hidden-import=requests',
+        '--hidden-import=scipy.signal',
         # Add data files
         '--add-data=app_icon.ico;.',
         # Set paths
@@ -1,24 +1,33 @@
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image
 
-# Create a new image with a white background
-size = (256, 256)
-img = Image.new('RGB', size, '#0078d4')
-draw = ImageDraw.Draw(img)
+def make_icon(path='app_icon.ico'):
+    """Render the sound wave app icon and save it as an ICO file."""
+    # Create the pixel buffer filled with the background colour
+    size = (256, 256)
+    pixels = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    pixels[:] = (0x00, 0x78, 0xd4)  # #0078d4
 
-# Draw a simple sound wave icon
-padding = 40
-wave_height = size[1] - 2 * padding
-wave_width = size[0] - 2 * padding
+    # Draw a simple sound wave icon
+    padding = 40
+    wave_height = size[1] - 2 * padding
+    wave_width = size[0] - 2 * padding
+    line_width = 16
 
-# Draw vertical lines
-x_positions = [padding + wave_width * x / 4 for x in range(5)]
-heights = [0.5, 0.8, 1.0, 0.8, 0.5]  # Relative heights
+    # Draw vertical lines as filled rectangles (one slice assignment each)
+    x_positions = [padding + wave_width * x / 4 for x in range(5)]
+    heights = [0.5, 0.8, 1.0, 0.8, 0.5]  # Relative heights
 
-for x, height in zip(x_positions, heights):
-    line_height = wave_height * height
-    y1 = (size[1] - line_height) / 2
-    y2 = y1 + line_height
-    draw.line([(x, y1), (x, y2)], fill='white', width=16)
+    for x, height in zip(x_positions, heights):
+        line_height = wave_height * height
+        y1 = round((size[1] - line_height) / 2)
+        y2 = round(y1 + line_height)
+        x1 = round(x) - line_width // 2
+        pixels[y1:y2 + 1, x1:x1 + line_width] = 255
 
-# Save as ICO
-img.save('app_icon.ico', format='ICO') 
\ No newline at end of file
+    # Save as ICO
+    img = Image.fromarray(pixels)
+    img.save(path, format='ICO')
+
+if __name__ == '__main__':
+    make_icon()
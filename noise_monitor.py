@@ -1,85 +1,146 @@
 import sounddevice as sd
 import numpy as np
 import time
-import os
+import math
+import re
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import wave
-import datetime
+import bisect
+import queue
+import threading
 import soundfile as sf
 from scipy import signal
 
 # Telegram configuration
 TOKEN = ""
 CHAT_ID = ""
+TELEGRAM_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+
+# Shared session so consecutive Telegram calls reuse one keep-alive TLS connection
+_tg_session = requests.Session()
+_tg_session.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),  # 429 is handled by _post_telegram
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+))
+
+# Alerts are sent from a background thread so uploads never stall audio capture
+_alert_q = queue.Queue(maxsize=8)
+ALERT_FLUSH_TIMEOUT = 30  # Seconds allowed on exit to send alerts still queued
+
+# Offset from dBFS to the estimated dB SPL used for thresholds and messages
+SPL_OFFSET = 90
+
+# libsndfile Vorbis compression level (0 = best quality, 1 = smallest); 0.9 is about oggenc -q 1,
+# plenty for a diagnostic clip and roughly half the default upload size
+OGG_COMPRESSION = 0.9
 
 # Noise level states
 NOISE_NORMAL = 0
 NOISE_HIGH = 1
 
+# dB thresholds shared by the emoji and description lookups (upper bounds, exclusive)
+_LEVEL_THRESHOLDS = (-60, -50, -40, -30, -20, -10)
+_LEVEL_EMOJIS = (
+    "🔇",  # Muted
+    "🔈",  # Low volume
+    "🔉",  # Medium-low volume
+    "🔊",  # Medium volume
+    "🔊",  # Medium-high volume
+    "🔊",  # High volume
+    "🔊",  # Very high volume
+)
+_LEVEL_DESCRIPTIONS = (
+    "Very Quiet (Almost Silent)",
+    "Quiet (Whisper)",
+    "Moderate (Quiet Room)",
+    "Normal (Normal Conversation)",
+    "Loud (Office Noise)",
+    "Very Loud (City Traffic)",
+    "Extremely Loud (Power Tools/Concert)",
+)
+
 def get_noise_emoji(db_level):
     """Get appropriate emoji based on noise level."""
-    if db_level < -60:
-        return "🔇"  # Muted
-    elif db_level < -50:
-        return "🔈"  # Low volume
-    elif db_level < -40:
-        return "🔉"  # Medium-low volume
-    elif db_level < -30:
-        return "🔊"  # Medium volume
-    elif db_level < -20:
-        return "🔊"  # Medium-high volume
-    elif db_level < -10:
-        return "🔊"  # High volume
-    else:
-        return "🔊"  # Very high volume
+    return _LEVEL_EMOJIS[bisect.bisect_right(_LEVEL_THRESHOLDS, db_level)]
 
-def format_telegram_message(db_level, threshold_db, audio_file_path, is_alert=True):
-    """Format a beautiful Telegram message with emojis."""
-    emoji = get_noise_emoji(db_level)
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    if is_alert:
-        return f"""
+_ALERT_TMPL = """
 🚨 NOISE ALERT 🚨
-{emoji} Current noise level: {db_level:.1f} dB SPL
-⚠️ Exceeded threshold: {threshold_db} dB SPL
+{emoji} Current noise level: {db:.1f} dB SPL
+⚠️ Exceeded threshold: {threshold} dB SPL
 ⏰ Time: {timestamp}
 
 📝 Details:
-• Noise level: {db_level:.1f} dB SPL
-• Threshold: {threshold_db} dB SPL
-• Recording: {audio_file_path}
+• Noise level: {db:.1f} dB SPL
+• Threshold: {threshold} dB SPL
+• Recording: {path}
 
 🎧 Audio recording attached below ⬇️
 """
-    else:
-        return f"""
+
+_NORMAL_TMPL = """
 ✅ NOISE RETURNED TO NORMAL ✅
-{emoji} Current noise level: {db_level:.1f} dB SPL
+{emoji} Current noise level: {db:.1f} dB SPL
 ⏰ Time: {timestamp}
 
 📝 Details:
-• Current level: {db_level:.1f} dB SPL
-• Normal threshold: {threshold_db} dB SPL
+• Current level: {db:.1f} dB SPL
+• Normal threshold: {threshold} dB SPL
 """
 
+def format_telegram_message(db_level, threshold_db, audio_file_path, is_alert=True):
+    """Format a beautiful Telegram message with emojis."""
+    template = _ALERT_TMPL if is_alert else _NORMAL_TMPL
+    return template.format_map({
+        "emoji": get_noise_emoji(db_level),
+        "db": db_level,
+        "threshold": threshold_db,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "path": audio_file_path
+    })
+
+def moving_average(audio_data, window_size, out=None):
+    """Box filter equivalent to np.convolve(..., mode='same') in O(N) using a cumulative sum."""
+    # Zero-pad like 'same' convolution, then every window sum is a difference of two prefix sums.
+    # The prefix sums are the one float64 intermediate: float32 would drift over a long recording.
+    c = np.concatenate((
+        np.zeros(window_size // 2 + 1, dtype=np.float64),
+        audio_data,
+        np.zeros((window_size - 1) // 2, dtype=np.float64)
+    ))
+    np.cumsum(c, out=c)
+    if out is None:
+        out = np.empty(len(audio_data), dtype=np.float32)
+    np.subtract(c[window_size:], c[:-window_size], out=out)
+    out /= window_size
+    return out
+
 def normalize_audio(audio_data):
     """Normalize audio data to prevent clipping and improve quality."""
-    # Ensure audio_data is a 1D array
-    audio_data = np.squeeze(audio_data)
+    # Copy into a single 1D float32 buffer; every step below works on it in place
+    audio_data = np.array(np.squeeze(audio_data), dtype=np.float32)
     
     # Remove DC offset
-    audio_data = audio_data - np.mean(audio_data)
+    audio_data -= audio_data.mean(dtype=np.float32)
     
     # Apply a simple moving average filter
     window_size = min(1000, len(audio_data) // 2)
     if window_size > 0:
-        audio_data = np.convolve(audio_data, np.ones(window_size)/window_size, mode='same')
+        moving_average(audio_data, window_size, out=audio_data)
     
     # Normalize to prevent clipping while maintaining relative levels
-    max_val = np.max(np.abs(audio_data))
+    max_val = float(max(audio_data.max(), -audio_data.min())) if audio_data.size else 0.0
     if max_val > 0:
-        audio_data = audio_data * (0.9 / max_val)  # Leave some headroom
+        audio_data *= np.float32(0.9 / max_val)  # Leave some headroom
     
     return audio_data
 
@@ -87,86 +148,147 @@ def amplitude_to_db(amplitude, reference=1.0):
     """Convert amplitude to decibels."""
     if amplitude <= 0:
         return -float('inf')
-    return 20 * np.log10(amplitude / reference)
+    return 20 * math.log10(amplitude / reference)
+
+def get_mean_square(data):
+    """Mean square of int16 mono audio data, scaled so that 1.0 is full scale."""
+    # Single fused square+sum pass with an int64 accumulator, no data**2 temporary
+    sum_sq = int(np.einsum('i,i->', data, data, dtype=np.int64))
+    return sum_sq / data.size / (32768.0 * 32768.0)
 
 def get_noise_level(data):
-    """Calculate RMS of audio data and convert to dB."""
-    if data.ndim > 1:  # If stereo, convert to mono
-        data = np.mean(data, axis=1)
-    rms = np.sqrt(np.mean(data**2))
-    db = amplitude_to_db(rms)
-    return db
+    """Calculate RMS of int16 mono audio data and convert to dB."""
+    # Scalar math from here on; NumPy ufuncs on 0-d values are far slower
+    return amplitude_to_db(math.sqrt(get_mean_square(data)))
+
+def ring_write(ring, write_idx, data):
+    """Copy data into the ring buffer at write_idx, wrapping at the end. Returns the new cursor."""
+    frames = len(data)
+    first = min(frames, len(ring) - write_idx)
+    np.copyto(ring[write_idx:write_idx + first], data[:first])
+    if first < frames:
+        np.copyto(ring[:frames - first], data[first:])
+    return (write_idx + frames) % len(ring)
+
+def ring_tail(ring, write_idx, frames, out):
+    """Return the last `frames` samples of the ring buffer, oldest first.
+
+    A zero-copy view is returned when the window does not wrap; otherwise the
+    two halves are copied into the preallocated `out` buffer.
+    """
+    start = write_idx - frames
+    if start >= 0:
+        return ring[start:write_idx]
+    np.copyto(out[:-start], ring[start:])
+    np.copyto(out[-start:frames], ring[:write_idx])
+    return out[:frames]
+
+# Name fragments of virtual/loopback inputs ('sound mapper' is covered by 'mapper')
+_VIRTUAL_DEVICE_RE = re.compile(
+    r'virtual|mapper|streaming|oculus|directsound|desktop audio',
+    re.IGNORECASE
+)
 
 def is_physical_device(device_name):
     """Check if the device is likely a physical microphone."""
-    virtual_keywords = [
-        'virtual', 'mapper', 'streaming', 'oculus',
-        'sound mapper', 'directsound', 'desktop audio'
-    ]
-    device_name_lower = device_name.lower()
-    return not any(keyword in device_name_lower for keyword in virtual_keywords)
-
-def send_telegram_alert(message, audio_file_path=None):
-    """Send an alert to Telegram with a message and optionally an audio file."""
-    url = f"https://api.telegram.org/bot{TOKEN}/sendMessage"
+    return _VIRTUAL_DEVICE_RE.search(device_name) is None
+
+def _post_telegram(method, **kwargs):
+    """POST to the Telegram Bot API, waiting out 429 rate limits."""
+    url = f"https://api.telegram.org/bot{TOKEN}/{method}"
+    while True:
+        response = _tg_session.post(url, timeout=TELEGRAM_TIMEOUT, **kwargs)
+        if response.status_code != 429:
+            return response
+        retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+        print(f"Telegram rate limit hit, retrying in {retry_after} seconds...")
+        time.sleep(retry_after)
+        # Rewind uploads so the retry sends the whole file again
+        for _, file in kwargs.get('files', {}).values():
+            file.seek(0)
+
+def send_telegram_alert(message, audio=None):
+    """Send an alert to Telegram with a message and optionally an (upload name, temp file) audio pair."""
     data = {
         "chat_id": CHAT_ID,
         "text": message,
         "parse_mode": "HTML"
     }
-    response = requests.post(url, data=data)
+    response = _post_telegram("sendMessage", data=data)
     if response.status_code == 200:
         print("Message sent successfully.")
     else:
         print(f"Failed to send message: {response.text}")
 
-    if audio_file_path:
-        # Convert WAV to OGG for better Telegram compatibility and smaller size
-        ogg_file_path = audio_file_path.replace('.wav', '.ogg')
-        data, samplerate = sf.read(audio_file_path)
-        sf.write(ogg_file_path, data, samplerate)
-
+    if audio:
         # Send the audio file
-        url = f"https://api.telegram.org/bot{TOKEN}/sendAudio"
-        files = {
-            'audio': open(ogg_file_path, 'rb')
-        }
         data = {
             'chat_id': CHAT_ID
         }
-        response = requests.post(url, files=files, data=data)
+        with audio[1]:  # Closing the temporary file deletes it
+            response = _post_telegram("sendAudio", files={'audio': audio}, data=data)
         if response.status_code == 200:
             print("Audio file sent successfully.")
-            # Clean up temporary files
-            os.remove(audio_file_path)
-            os.remove(ogg_file_path)
         else:
             print(f"Failed to send audio file: {response.text}")
 
+def _alert_worker():
+    """Send queued alerts one at a time in the background until a None sentinel arrives."""
+    while True:
+        item = _alert_q.get()
+        if item is None:
+            return
+        message, audio = item
+        try:
+            send_telegram_alert(message, audio)
+        except Exception as e:
+            print(f"Error sending alert: {str(e)}")
+
+def queue_telegram_alert(message, audio=None):
+    """Queue an alert for the background sender, dropping the oldest one if the queue is full."""
+    while True:
+        try:
+            _alert_q.put_nowait((message, audio))
+            return
+        except queue.Full:
+            try:
+                _, dropped_audio = _alert_q.get_nowait()
+            except queue.Empty:
+                continue
+            print("Alert queue full, dropping the oldest alert.")
+            if dropped_audio:
+                dropped_audio[1].close()
+
+def flush_telegram_alerts(sender, timeout=ALERT_FLUSH_TIMEOUT):
+    """Let the sender finish the queued alerts within `timeout` seconds, then discard the rest."""
+    deadline = time.monotonic() + timeout
+    try:
+        _alert_q.put(None, timeout=timeout)
+    except queue.Full:
+        pass
+    sender.join(max(0.0, deadline - time.monotonic()))
+    if sender.is_alive():
+        print("Timed out sending queued alerts.")
+
+    # Close whatever was not sent so the temporary audio files are deleted
+    while True:
+        try:
+            item = _alert_q.get_nowait()
+        except queue.Empty:
+            break
+        if item and item[1]:
+            item[1].close()
+
 def get_noise_description(db_level):
     """Convert dB level to human-readable noise description."""
-    if db_level < -60:
-        return "Very Quiet (Almost Silent)"
-    elif db_level < -50:
-        return "Quiet (Whisper)"
-    elif db_level < -40:
-        return "Moderate (Quiet Room)"
-    elif db_level < -30:
-        return "Normal (Normal Conversation)"
-    elif db_level < -20:
-        return "Loud (Office Noise)"
-    elif db_level < -10:
-        return "Very Loud (City Traffic)"
-    else:
-        return "Extremely Loud (Power Tools/Concert)"
+    return _LEVEL_DESCRIPTIONS[bisect.bisect_right(_LEVEL_THRESHOLDS, db_level)]
 
-def get_optimal_device_settings(device_id):
-    """Get optimal settings for the audio device."""
-    device_info = sd.query_devices(device_id)
+def get_optimal_device_settings(device_info):
+    """Get optimal settings for the audio device described by a query_devices() entry."""
     return {
         'samplerate': int(device_info['default_samplerate']),
-        'channels': min(device_info['max_input_channels'], 2),  # Use stereo if available
-        'dtype': 'float32',
+        'channels': 1,  # Loudness detection only needs mono
+        'dtype': 'int16',  # Half the bytes of float32; everything downstream is lossy anyway
         'latency': 'low'  # Use low latency for better quality
     }
 
@@ -186,74 +308,90 @@ def monitor_usb_mic(duration=1, record_duration=10, threshold_db=30, alert_inter
         return
 
     # Get optimal device settings
-    settings = get_optimal_device_settings(usb_mic_id)
+    settings = get_optimal_device_settings(devices[usb_mic_id])
     print(f"Using settings: {settings}")
 
+    sender = threading.Thread(target=_alert_worker, daemon=True)
+    sender.start()
+
+    samplerate = settings['samplerate']
+    window_frames = int(duration * samplerate)
+    ring = np.zeros(max(int(record_duration * samplerate), window_frames), dtype=np.int16)
+    write_idx = 0
+    # Scratch buffers allocated once, used whenever a read wraps around the ring
+    detect_buf = np.empty(window_frames, dtype=np.int16)
+    clip_buf = np.empty(len(ring), dtype=np.int16)
+
+    def callback(indata, frames, time_info, status):
+        nonlocal write_idx
+        if status:
+            print(f"Stream status: {status}")
+        write_idx = ring_write(ring, write_idx, indata.reshape(-1))
+
+    # Compare loudness in the mean-square domain so the threshold check needs no log
+    mean_sq_threshold = 10 ** ((threshold_db - SPL_OFFSET) / 10)
+
     last_alert_time = 0
     noise_state = NOISE_NORMAL
 
-    # Create a stream for continuous monitoring
+    # A single persistent stream feeds the ring buffer; no per-iteration recordings
     with sd.InputStream(
         device=usb_mic_id,
         **settings,
-        callback=None
-    ) as stream:
+        callback=callback
+    ):
         while True:
             try:
                 print(f"\nListening to: Microphone (USB MIC PRO)")
-                # Read audio data
-                recording = sd.rec(
-                    int(duration * settings['samplerate']),
-                    **settings,
-                    device=usb_mic_id,
-                    blocking=True
-                )
-
-                noise_level_db = get_noise_level(recording)
+                time.sleep(duration)
+                recording = ring_tail(ring, write_idx, window_frames, detect_buf)
+
+                mean_sq = get_mean_square(recording)
+                is_loud = mean_sq > mean_sq_threshold
+
+                noise_level_db = amplitude_to_db(math.sqrt(mean_sq))
                 noise_description = get_noise_description(noise_level_db)
                 print(f"Noise level: {noise_level_db:.1f} dB - {noise_description}")
 
-                offset = 90
-                db_spl = noise_level_db + offset
+                db_spl = noise_level_db + SPL_OFFSET
                 print(f"Estimated SPL: {db_spl:.1f} dB SPL (raw: {noise_level_db:.1f} dBFS)")
 
                 current_time = time.time()
                 
-                if db_spl > threshold_db and (current_time - last_alert_time) >= alert_interval:
+                if is_loud and (current_time - last_alert_time) >= alert_interval:
                     if noise_state == NOISE_NORMAL:
-                        print(f"Noise level exceeds {threshold_db} dB. Recording audio for {record_duration} seconds...")
+                        print(f"Noise level exceeds {threshold_db} dB. Saving the last {record_duration} seconds of audio...")
                         try:
-                            # High-quality recording
-                            long_recording = sd.rec(
-                                int(record_duration * settings['samplerate']),
-                                **settings,
-                                device=usb_mic_id,
-                                blocking=True
-                            )
-
-                            # Save as WAV with high quality
-                            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                            audio_file_path = f"noise_alert_{timestamp}.wav"
-                            sf.write(audio_file_path, long_recording, settings['samplerate'])
-
-                            message = format_telegram_message(db_spl, threshold_db, audio_file_path, True)
-                            send_telegram_alert(message, audio_file_path)
+                            # Snapshot the whole ring buffer (oldest sample first)
+                            long_recording = ring_tail(ring, write_idx, len(ring), clip_buf)
+
+                            # Encode straight to OGG for Telegram compatibility and smaller size,
+                            # into a temporary file that is deleted as soon as it is closed
+                            audio_name = time.strftime("noise_alert_%Y%m%d_%H%M%S.ogg")
+                            audio_file = tempfile.NamedTemporaryFile(suffix='.ogg')
+                            sf.write(audio_file, long_recording, samplerate, format='OGG', subtype='VORBIS',
+                                     compression_level=OGG_COMPRESSION)
+                            audio_file.seek(0)
+
+                            message = format_telegram_message(db_spl, threshold_db, audio_name, True)
+                            queue_telegram_alert(message, (audio_name, audio_file))
                             last_alert_time = current_time
                             noise_state = NOISE_HIGH
                         except Exception as e:
                             print(f"Error during recording: {str(e)}")
                             continue
                 
-                elif db_spl <= threshold_db and noise_state == NOISE_HIGH:
+                elif not is_loud and noise_state == NOISE_HIGH:
                     message = format_telegram_message(db_spl, threshold_db, None, False)
-                    send_telegram_alert(message)
+                    queue_telegram_alert(message)
                     noise_state = NOISE_NORMAL
-
-                time.sleep(1)
             except KeyboardInterrupt:
                 print("\nMonitoring stopped by user.")
                 break
 
+    # Queued alerts (e.g. a just-raised alert or its 'back to normal') still go out
+    flush_telegram_alerts(sender)
+
 if __name__ == "__main__":
     print("Noise Level Monitor (USB MIC PRO Only)")
     print("----------------------------------------")
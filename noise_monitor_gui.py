@@ -1,22 +1,35 @@
 import sys
+import argparse
+import io
 import os
+import re
+import string
 import winreg
+import functools
+import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QSystemTrayIcon, QMenu, QDialog, QLineEdit, QFormLayout, QSpinBox,
     QComboBox, QCheckBox, QMessageBox, QFrame, QGridLayout
 )
-from PySide6.QtCore import Qt, QTimer, QSettings, QSize, QPropertyAnimation
-from PySide6.QtGui import QIcon, QAction, QFont, QPalette, QColor
+from PySide6.QtCore import (
+    Qt, QTimer, QSettings, QSize, QPropertyAnimation, Signal, QObject
+)
+from PySide6.QtGui import QIcon, QAction, QFont, QPalette, QColor, QPixmap, QPainter
 import sounddevice as sd
 import numpy as np
 import soundfile as sf
+from scipy import signal
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import datetime
 import time
-import threading
 import qtawesome as qta
 import logging
 
@@ -27,13 +40,232 @@ DEFAULT_THRESHOLD = 30
 DEFAULT_SPIKE_DURATION = 500
 SAMPLE_RATE = 44100
 CHUNK_DURATION = 0.1  # 100ms chunks
+RECORD_DURATION = 10  # Seconds of audio in the alert window and attached to alerts
+LEVEL_SMOOTHING = 0.2  # EMA weight of each new chunk in the displayed level
+UI_REFRESH_MS = 200
 ALERT_COOLDOWN = 600  # 10 minutes in seconds
+SPECTRAL_BAND = (100, 8000)  # Hz range measured by the spectral filter
+OGG_COMPRESSION = 0.9  # libsndfile Vorbis level (0 best .. 1 smallest); about oggenc -q 1
+TELEGRAM_TIMEOUT = (3, 15)  # (connect, read) seconds; the read covers the audio upload
 ICON_SIZE = QSize(12, 12)
 
+# Label formatters bound once instead of building an f-string per refresh
+_LEVEL_TEXT = "{:.1f}".format
+_MIN_TEXT = "Min: {:.1f} dB".format
+_MAX_TEXT = "Max: {:.1f} dB".format
+_DEVICE_TEXT = "Device: {}".format
+_THRESHOLD_TEXT = "Threshold: {} dB".format
+
+# Characters Telegram's legacy Markdown treats as entity markers
+_MARKDOWN_SPECIAL_RE = re.compile(r'([_*`\[])')
+
+# Telegram alert caption; $thr and $dev are baked in when settings change
+_ALERT_TEMPLATE = string.Template("""
+🚨 *NOISE ALERT* 🚨
+
+📊 *Noise Levels (10s sample):*
+• Average: $avg dB(A)
+• Maximum: $max dB(A)
+• Minimum: $min dB(A)
+
+⏰ Time: $ts
+
+📍 *Alert Details:*
+• Threshold: $thr dB(A)
+• Device: $dev
+""")
+
 # Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(APP_NAME)
 
+def a_weighting_sos(samplerate: int) -> np.ndarray:
+    """IEC 61672 A-weighting filter as second-order sections, normalised to 0 dB at 1 kHz."""
+    f1, f2, f3, f4 = 20.598997, 107.65265, 737.86223, 12194.217
+    zeros = [0.0] * 4
+    poles = [-2 * math.pi * f for f in (f1, f1, f2, f3, f4, f4)]
+    sos = signal.zpk2sos(*signal.bilinear_zpk(zeros, poles, 1.0, samplerate))
+    _, h = signal.sosfreqz(sos, worN=[1000.0], fs=samplerate)
+    sos[0, :3] /= abs(h[0])
+    return sos
+
+A_WEIGHTING_SOS = a_weighting_sos(SAMPLE_RATE)
+
+@functools.lru_cache(maxsize=1)
+def query_devices_cached():
+    """Enumerate audio devices once; clear the cache to pick up newly attached devices."""
+    return sd.query_devices()
+
+@functools.lru_cache(maxsize=64)
+def _cached_icon(name: str, **options) -> QIcon:
+    """qtawesome icon, rasterised from the font glyph only once per name and options."""
+    return qta.icon(name, **options)
+
+_DARK_QSS = """
+    QMainWindow, QDialog {
+        background-color: #1A1A1A;
+        color: #E0E0E0;
+    }
+    QLabel {
+        color: #E0E0E0;
+        font-family: 'Segoe UI', Arial;
+        padding: 2px 4px;
+    }
+    QLabel#title {
+        font-size: 14px;
+        font-weight: bold;
+        color: #4CAF50;
+        padding: 2px 4px;
+    }
+    QLabel#form-label {
+        font-size: 12px;
+    }
+    QPushButton {
+        background-color: #4CAF50;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        font-family: 'Segoe UI', Arial;
+        font-size: 12px;
+    }
+    QPushButton:hover {
+        background-color: #45A049;
+    }
+    QPushButton:pressed {
+        background-color: #3D8B40;
+    }
+    QFrame {
+        background-color: #252525;
+        border: 1px solid #333333;
+        border-radius: 6px;
+    }
+    QLineEdit, QSpinBox, QComboBox {
+        background-color: #333333;
+        color: #E0E0E0;
+        border: 1px solid #444444;
+        border-radius: 4px;
+        padding: 2px 4px;
+        font-family: 'Segoe UI', Arial;
+        font-size: 12px;
+    }
+    QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
+        border: 1px solid #4CAF50;
+    }
+    QSpinBox::up-button, QSpinBox::down-button {
+        background-color: #444444;
+        border: none;
+        width: 14px;
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 18px;
+    }
+    QCheckBox {
+        color: #E0E0E0;
+        font-family: 'Segoe UI', Arial;
+        font-size: 12px;
+    }
+    QCheckBox::indicator {
+        width: 16px;
+        height: 16px;
+        border: 1px solid #444444;
+        border-radius: 3px;
+        background-color: #333333;
+    }
+    QCheckBox::indicator:checked {
+        background-color: #4CAF50;
+        border-color: #4CAF50;
+    }
+"""
+
+_LIGHT_QSS = """
+    QMainWindow, QDialog {
+        background-color: #F5F5F5;
+        color: #333333;
+    }
+    QLabel {
+        color: #333333;
+        font-family: 'Segoe UI', Arial;
+        padding: 2px 4px;
+    }
+    QLabel#title {
+        font-size: 14px;
+        font-weight: bold;
+        color: #4CAF50;
+        padding: 2px 4px;
+    }
+    QLabel#form-label {
+        font-size: 12px;
+    }
+    QPushButton {
+        background-color: #4CAF50;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        font-family: 'Segoe UI', Arial;
+        font-size: 12px;
+    }
+    QPushButton:hover {
+        background-color: #45A049;
+    }
+    QPushButton:pressed {
+        background-color: #3D8B40;
+    }
+    QFrame {
+        background-color: #FFFFFF;
+        border: 1px solid #E0E0E0;
+        border-radius: 6px;
+    }
+    QLineEdit, QSpinBox, QComboBox {
+        background-color: #FFFFFF;
+        color: #333333;
+        border: 1px solid #E0E0E0;
+        border-radius: 4px;
+        padding: 2px 4px;
+        font-family: 'Segoe UI', Arial;
+        font-size: 12px;
+    }
+    QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
+        border: 1px solid #4CAF50;
+    }
+    QSpinBox::up-button, QSpinBox::down-button {
+        background-color: #E0E0E0;
+        border: none;
+        width: 14px;
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 18px;
+    }
+    QCheckBox {
+        color: #333333;
+        font-family: 'Segoe UI', Arial;
+        font-size: 12px;
+    }
+    QCheckBox::indicator {
+        width: 16px;
+        height: 16px;
+        border: 1px solid #E0E0E0;
+        border-radius: 3px;
+        background-color: #FFFFFF;
+    }
+    QCheckBox::indicator:checked {
+        background-color: #4CAF50;
+        border-color: #4CAF50;
+    }
+"""
+
+def band_mean_square(block: np.ndarray, samplerate: int, band: Tuple[float, float]) -> float:
+    """Mean square of the energy inside a frequency band, from a single rfft of the block."""
+    n = len(block)
+    spectrum = np.fft.rfft(block)
+    lo, hi = (int(f * n / samplerate) for f in band)
+    in_band = spectrum[lo:hi + 1]
+    # Parseval for a one-sided spectrum: mean square = 2 * sum(|X_k|^2) / N^2
+    return 2.0 * np.vdot(in_band, in_band).real / (n * n)
+
 class ThemeManager:
     """Manages application themes and styles."""
     
@@ -48,167 +280,29 @@ class ThemeManager:
                 value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
                 return value == 0
         except Exception as e:
-            logger.error(f"Error checking system theme: {e}")
+            logger.error("Error checking system theme: %s", e)
             return False
 
     @staticmethod
     def get_stylesheet(theme: str) -> str:
         """Return stylesheet based on theme with adjusted input sizes."""
         if theme == "Dark" or (theme == "System" and ThemeManager.is_system_dark_theme()):
-            return """
-                QMainWindow, QDialog {
-                    background-color: #1A1A1A;
-                    color: #E0E0E0;
-                }
-                QLabel {
-                    color: #E0E0E0;
-                    font-family: 'Segoe UI', Arial;
-                    padding: 2px 4px;
-                }
-                QLabel#title {
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #4CAF50;
-                    padding: 2px 4px;
-                }
-                QLabel#form-label {
-                    font-size: 12px;
-                }
-                QPushButton {
-                    background-color: #4CAF50;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    font-family: 'Segoe UI', Arial;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #45A049;
-                }
-                QPushButton:pressed {
-                    background-color: #3D8B40;
-                }
-                QFrame {
-                    background-color: #252525;
-                    border: 1px solid #333333;
-                    border-radius: 6px;
-                }
-                QLineEdit, QSpinBox, QComboBox {
-                    background-color: #333333;
-                    color: #E0E0E0;
-                    border: 1px solid #444444;
-                    border-radius: 4px;
-                    padding: 2px 4px;
-                    font-family: 'Segoe UI', Arial;
-                    font-size: 12px;
-                }
-                QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
-                    border: 1px solid #4CAF50;
-                }
-                QSpinBox::up-button, QSpinBox::down-button {
-                    background-color: #444444;
-                    border: none;
-                    width: 14px;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                    width: 18px;
-                }
-                QCheckBox {
-                    color: #E0E0E0;
-                    font-family: 'Segoe UI', Arial;
-                    font-size: 12px;
-                }
-                QCheckBox::indicator {
-                    width: 16px;
-                    height: 16px;
-                    border: 1px solid #444444;
-                    border-radius: 3px;
-                    background-color: #333333;
-                }
-                QCheckBox::indicator:checked {
-                    background-color: #4CAF50;
-                    border-color: #4CAF50;
-                }
-            """
-        return """
-            QMainWindow, QDialog {
-                background-color: #F5F5F5;
-                color: #333333;
-            }
-            QLabel {
-                color: #333333;
-                font-family: 'Segoe UI', Arial;
-                padding: 2px 4px;
-            }
-            QLabel#title {
-                font-size: 14px;
-                font-weight: bold;
-                color: #4CAF50;
-                padding: 2px 4px;
-            }
-            QLabel#form-label {
-                font-size: 12px;
-            }
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-family: 'Segoe UI', Arial;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #45A049;
-            }
-            QPushButton:pressed {
-                background-color: #3D8B40;
-            }
-            QFrame {
-                background-color: #FFFFFF;
-                border: 1px solid #E0E0E0;
-                border-radius: 6px;
-            }
-            QLineEdit, QSpinBox, QComboBox {
-                background-color: #FFFFFF;
-                color: #333333;
-                border: 1px solid #E0E0E0;
-                border-radius: 4px;
-                padding: 2px 4px;
-                font-family: 'Segoe UI', Arial;
-                font-size: 12px;
-            }
-            QLineEdit:focus, QSpinBox:focus, QComboBox:focus {
-                border: 1px solid #4CAF50;
-            }
-            QSpinBox::up-button, QSpinBox::down-button {
-                background-color: #E0E0E0;
-                border: none;
-                width: 14px;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 18px;
-            }
-            QCheckBox {
-                color: #333333;
-                font-family: 'Segoe UI', Arial;
-                font-size: 12px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                border: 1px solid #E0E0E0;
-                border-radius: 3px;
-                background-color: #FFFFFF;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4CAF50;
-                border-color: #4CAF50;
-            }
-        """
+            return _DARK_QSS
+        return _LIGHT_QSS
+
+# Every persisted setting: key -> (default, type)
+_SETTINGS_DEFAULTS = {
+    "audio_device": ("", str),
+    "telegram_token": ("", str),
+    "telegram_chat_id": ("", str),
+    "threshold": (DEFAULT_THRESHOLD, int),
+    "filter_micro_lags": (True, bool),
+    "spike_duration_ms": (DEFAULT_SPIKE_DURATION, int),
+    "spectral_filter": (False, bool),
+    "autostart": (False, bool),
+    "start_minimized": (False, bool),
+    "theme": ("System", str),
+}
 
 class SettingsManager:
     """Manages application settings and autostart configuration."""
@@ -224,6 +318,10 @@ class SettingsManager:
         """Set a setting."""
         self.settings.setValue(key, value)
 
+    def as_dict(self) -> dict:
+        """Read every setting at once, typed, for in-memory lookups."""
+        return {key: self.get(key, default, type=t) for key, (default, t) in _SETTINGS_DEFAULTS.items()}
+
     def set_autostart(self, enabled: bool, app_path: str) -> None:
         """Set or remove autostart registry entry."""
         key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
@@ -237,14 +335,25 @@ class SettingsManager:
                     except FileNotFoundError:
                         pass
         except Exception as e:
-            logger.error(f"Error setting autostart: {e}")
+            logger.error("Error setting autostart: %s", e)
+
+_settings_singleton: Optional[SettingsManager] = None
+
+def get_settings() -> SettingsManager:
+    """Return the process-wide SettingsManager, sharing one QSettings handle."""
+    global _settings_singleton
+    if _settings_singleton is None:
+        _settings_singleton = SettingsManager()
+    return _settings_singleton
 
 class SettingsDialog(QDialog):
     """Dialog for configuring application settings."""
+
+    settingsChanged = Signal()
     
     def __init__(self, parent: Optional[QMainWindow] = None):
         super().__init__(parent)
-        self.settings_manager = SettingsManager()
+        self.settings_manager = get_settings()
         animation = QPropertyAnimation(self, b"windowOpacity")
         animation.setDuration(200)
         animation.setStartValue(0.9)
@@ -252,7 +361,7 @@ class SettingsDialog(QDialog):
         animation.start()
 
         self.setWindowTitle("Settings")
-        self.setFixedSize(440, 650)
+        self.setFixedSize(440, 680)
         self.setup_ui()
         self.apply_theme()
 
@@ -272,9 +381,17 @@ class SettingsDialog(QDialog):
         device_title.setObjectName("title")
         device_layout.addWidget(device_title)
         
+        device_row = QHBoxLayout()
         self.device_combo = QComboBox()
         self.refresh_devices()
-        device_layout.addWidget(self.device_combo)
+        device_row.addWidget(self.device_combo, stretch=1)
+
+        refresh_button = QPushButton(_cached_icon('fa5s.sync'), "")
+        refresh_button.setToolTip("Rescan Audio Devices")
+        refresh_button.setFixedSize(28, 28)
+        refresh_button.clicked.connect(self.rescan_devices)
+        device_row.addWidget(refresh_button)
+        device_layout.addLayout(device_row)
         layout.addWidget(device_frame)
 
         # Telegram Settings
@@ -363,6 +480,11 @@ class SettingsDialog(QDialog):
         self.spike_duration_spin.setValue(self.settings_manager.get("spike_duration_ms", DEFAULT_SPIKE_DURATION, type=int))
         self.spike_duration_spin.setSuffix(" ms")
         filter_layout.addRow(duration_label, self.spike_duration_spin)
+
+        self.spectral_check = QCheckBox(f"Spectral Filter ({SPECTRAL_BAND[0]}-{SPECTRAL_BAND[1]} Hz)")
+        self.spectral_check.setToolTip("Alert on the energy in this frequency band instead of counting loud chunks")
+        self.spectral_check.setChecked(self.settings_manager.get("spectral_filter", False, type=bool))
+        filter_layout.addRow(self.spectral_check)
         layout.addWidget(filter_frame)
 
         # Startup Settings
@@ -386,22 +508,35 @@ class SettingsDialog(QDialog):
         layout.addWidget(startup_frame)
 
         # Save Button
-        save_button = QPushButton(qta.icon('fa5s.save'), "Save Settings")
+        save_button = QPushButton(_cached_icon('fa5s.save'), "Save Settings")
         save_button.clicked.connect(self.save_settings)
         layout.addWidget(save_button, alignment=Qt.AlignRight)
 
     def refresh_devices(self) -> None:
         """Refresh the list of audio devices."""
+        current_device = self.device_combo.currentText() or self.settings_manager.get("audio_device", "")
         self.device_combo.clear()
-        devices = sd.query_devices()
+        devices = query_devices_cached()
         for i, device in enumerate(devices):
             if device['max_input_channels'] > 0:
                 self.device_combo.addItem(device['name'], i)
-        current_device = self.settings_manager.get("audio_device", "")
         index = self.device_combo.findText(current_device)
         if index >= 0:
             self.device_combo.setCurrentIndex(index)
 
+    def rescan_devices(self) -> None:
+        """Reinitialise PortAudio so newly attached devices are listed, then refresh the list."""
+        # PortAudio only enumerates devices on initialisation, and that needs every stream closed
+        window = self.parent() if isinstance(self.parent(), QMainWindow) else None
+        if window is not None:
+            window.audio_worker.close_stream()
+        sd._terminate()
+        sd._initialize()
+        query_devices_cached.cache_clear()
+        self.refresh_devices()
+        if window is not None:
+            window.setup_audio()  # Device indices may have shifted, so resolve by name again
+
     def save_settings(self) -> None:
         """Save settings and update autostart."""
         self.settings_manager.set("audio_device", self.device_combo.currentText())
@@ -410,6 +545,7 @@ class SettingsDialog(QDialog):
         self.settings_manager.set("threshold", self.threshold_spin.value())
         self.settings_manager.set("filter_micro_lags", self.filter_check.isChecked())
         self.settings_manager.set("spike_duration_ms", self.spike_duration_spin.value())
+        self.settings_manager.set("spectral_filter", self.spectral_check.isChecked())
         self.settings_manager.set("autostart", self.autostart_check.isChecked())
         self.settings_manager.set("start_minimized", self.minimized_check.isChecked())
         self.settings_manager.set("theme", self.theme_combo.currentText())
@@ -417,6 +553,7 @@ class SettingsDialog(QDialog):
         app_path = sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__)
         self.settings_manager.set_autostart(self.autostart_check.isChecked(), app_path)
 
+        self.settingsChanged.emit()
         if isinstance(self.parent(), QMainWindow):
             self.parent().apply_theme()
         self.accept()
@@ -425,35 +562,275 @@ class SettingsDialog(QDialog):
         """Apply the selected theme."""
         self.setStyleSheet(ThemeManager.get_stylesheet(self.settings_manager.get("theme", "System")))
 
+class AudioWorker(QObject):
+    """Owns the input stream and measures each block in the audio callback; alerts are sent from a thread pool."""
+
+    errorOccurred = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.stream: Optional[sd.InputStream] = None
+        self.ring = np.zeros(int(RECORD_DURATION * SAMPLE_RATE), dtype=np.int16)
+        self.write_idx = 0
+        # Alert recordings alternate between two preallocated buffers; the cooldown guarantees
+        # an alert has been sent long before its buffer comes round again
+        self._alert_bufs = (np.empty_like(self.ring), np.empty_like(self.ring))
+        self._alert_buf_idx = 0
+        n_chunks = int(RECORD_DURATION / CHUNK_DURATION)
+        self._chunk_db = np.full(n_chunks, np.nan)  # dB(A) per chunk over the alert window, NaN if silent
+        self._chunk_band = np.zeros(n_chunks)  # Spectral band mean square per chunk
+        self._chunk_idx = 0
+        self._zi: Optional[np.ndarray] = None  # A-weighting filter state carried across blocks
+        self._lock = threading.Lock()  # Guards the running levels shared with the GUI thread
+        self._ema_db: Optional[float] = None
+        self._max_db = -math.inf  # Extremes since the last read_levels()
+        self._min_db = math.inf
+        self.alerts: queue.Queue = queue.Queue(maxsize=4)  # (avg, max, min, recording), drained by the GUI
+        self.monitoring = True
+        self._window_stale = False  # Set while paused; the alert window restarts on resume
+        self.alert_tmpl = _ALERT_TEMPLATE
+        self.telegram: Tuple[str, str] = ("", "")  # (sendAudio URL, chat id), set with the settings
+        self.cfg: dict = {}  # Settings snapshot, replaced as a whole by the window
+        self.last_alert_time = 0
+
+        # Kept for the process lifetime so successive alerts reuse one keep-alive TLS connection
+        self.http = requests.Session()
+        self.http.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+
+    def open_stream(self, device_id: Optional[int]) -> None:
+        """(Re)open the persistent input stream that feeds the ring buffer."""
+        self.close_stream()
+        self.ring.fill(0)
+        self.write_idx = 0
+        self._chunk_db.fill(np.nan)
+        self._chunk_band.fill(0)
+        self._chunk_idx = 0
+        self._zi = None
+        with self._lock:
+            self._ema_db = None
+            self._max_db = -math.inf
+            self._min_db = math.inf
+        if device_id is None:
+            return
+
+        try:
+            self.stream = sd.InputStream(
+                samplerate=SAMPLE_RATE,
+                channels=1,
+                dtype='int16',
+                blocksize=int(SAMPLE_RATE * CHUNK_DURATION),
+                device=device_id,
+                callback=self._audio_cb
+            )
+            self.stream.start()
+            logger.info("Input stream opened on %s (device %s) at %d Hz",
+                        query_devices_cached()[device_id]['name'], device_id, SAMPLE_RATE)
+        except Exception as e:
+            logger.error("Failed to open audio stream: %s", e)
+            self.stream = None
+            self.errorOccurred.emit(f"Error: {str(e)}")
+
+    def close_stream(self) -> None:
+        """Stop audio capture."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def _audio_cb(self, indata: np.ndarray, frames: int, time_info, status: sd.CallbackFlags) -> None:
+        """Store and measure each incoming chunk (runs on the PortAudio thread)."""
+        if not self.monitoring:
+            self._window_stale = True
+        elif self._window_stale:
+            # First chunk after a pause: paused audio must not trigger or fill an alert
+            self._window_stale = False
+            self.ring.fill(0)
+            self._chunk_db.fill(np.nan)
+            self._chunk_band.fill(0)
+
+        block = indata[:, 0]
+        w = self.write_idx
+        first = min(frames, len(self.ring) - w)
+        np.copyto(self.ring[w:w + first], block[:first])
+        if first < frames:
+            np.copyto(self.ring[:frames - first], block[first:])
+        self.write_idx = (w + frames) % len(self.ring)
+
+        try:
+            # A-weight before measuring so levels follow perceived loudness (dB(A))
+            if self._zi is None:
+                self._zi = signal.sosfilt_zi(A_WEIGHTING_SOS) * block[0]
+            weighted, self._zi = signal.sosfilt(A_WEIGHTING_SOS, block, zi=self._zi)
+            weighted *= 1.0 / 32768.0  # int16 counts -> full-scale float
+
+            mean_sq = np.dot(weighted, weighted) / frames
+            db = 10 * math.log10(mean_sq) + 90 if mean_sq > 0 else math.nan  # Convert to SPL
+            cfg = self.cfg  # Replaced as a whole on change, so this is a consistent snapshot
+
+            i = self._chunk_idx
+            self._chunk_db[i] = db
+            self._chunk_band[i] = band_mean_square(weighted, SAMPLE_RATE, SPECTRAL_BAND) if cfg['spectral_filter'] else 0.0
+            self._chunk_idx = (i + 1) % len(self._chunk_db)
+            if math.isnan(db):
+                return
+
+            with self._lock:
+                if self._ema_db is None:
+                    self._ema_db = db
+                else:
+                    self._ema_db += LEVEL_SMOOTHING * (db - self._ema_db)
+                if self.monitoring:  # Paused audio must not surface as extremes on resume
+                    self._max_db = max(self._max_db, db)
+                    self._min_db = min(self._min_db, db)
+
+            if self.monitoring:
+                self._check_alert(db, cfg)
+
+        except Exception as e:
+            logger.error("Recording error: %s", e)
+
+    def _check_alert(self, db: float, cfg: dict) -> None:
+        """Queue an alert if the alert window crosses the threshold and the cooldown has passed."""
+        threshold = cfg['threshold']
+        if cfg['spectral_filter']:
+            band_sq = float(self._chunk_band.mean())
+            should_alert = band_sq > 0 and 10 * math.log10(band_sq) + 90 > threshold
+        elif cfg['filter_micro_lags']:
+            required_chunks = int(cfg['spike_duration_ms'] / (CHUNK_DURATION * 1000))
+            should_alert = np.count_nonzero(self._chunk_db > threshold) >= required_chunks
+        else:
+            should_alert = db > threshold
+
+        current_time = time.time()
+        if should_alert and (current_time - self.last_alert_time) >= ALERT_COOLDOWN:
+            self.last_alert_time = current_time
+            levels = self._chunk_db[~np.isnan(self._chunk_db)]
+            recording = self._alert_bufs[self._alert_buf_idx]
+            self._alert_buf_idx ^= 1
+            w = self.write_idx
+            tail = len(self.ring) - w
+            np.copyto(recording[:tail], self.ring[w:])  # Oldest sample first
+            np.copyto(recording[tail:], self.ring[:w])
+            try:
+                self.alerts.put_nowait((float(levels.mean()), float(levels.max()), float(levels.min()), recording))
+            except queue.Full:
+                logger.warning("Alert queue full, dropping alert")
+
+    def read_levels(self) -> Optional[Tuple[float, float, float]]:
+        """Return (smoothed level, max, min) and reset the extremes; None before any audio."""
+        with self._lock:
+            if self._ema_db is None:
+                return None
+            levels = (self._ema_db, self._max_db, self._min_db)
+            self._max_db = -math.inf
+            self._min_db = math.inf
+        return levels
+
+    def set_alert_details(self, device_name: str, threshold: int) -> None:
+        """Pre-fill the alert fields that only change with the settings."""
+        self.alert_tmpl = string.Template(
+            _ALERT_TEMPLATE.safe_substitute(
+                thr=threshold,
+                dev=_MARKDOWN_SPECIAL_RE.sub(r'\\\1', device_name).replace('$', '$$')
+            )
+        )
+
+    def set_telegram(self, token: str, chat_id: str) -> None:
+        """Cache the Telegram destination so alerts never read settings."""
+        url = f"https://api.telegram.org/bot{token}/sendAudio" if token else ""
+        self.telegram = (url, chat_id)
+
+    def send_alert(self, avg_db: float, max_db: float, min_db: float, recording: np.ndarray) -> None:
+        """Send a Telegram alert with audio recording."""
+        url, chat_id = self.telegram  # Read once; replaced as a whole on settings change
+        if not (url and chat_id):
+            return  # Nowhere to send it, so skip the encode entirely
+
+        try:
+            # Encode the int16 capture straight to Vorbis in memory; nothing touches the disk
+            audio = io.BytesIO()
+            sf.write(audio, recording, SAMPLE_RATE, format='OGG', subtype='VORBIS', compression_level=OGG_COMPRESSION)
+            audio.seek(0)
+
+            message = self.alert_tmpl.substitute(
+                avg=f"{avg_db:.1f}",
+                max=f"{max_db:.1f}",
+                min=f"{min_db:.1f}",
+                ts=time.strftime('%Y-%m-%d %H:%M:%S')
+            )
+            # One request: the message rides along as the audio caption (Telegram caps it at 1024 chars)
+            response = self.http.post(
+                url,
+                data={"chat_id": chat_id, "caption": message[:1024], "parse_mode": "Markdown"},
+                files={"audio": ("noise_alert.ogg", audio, "audio/ogg")},
+                timeout=TELEGRAM_TIMEOUT
+            )
+            if not response.ok:
+                logger.error("Alert sending failed: HTTP %d %s", response.status_code, response.text)
+                self.errorOccurred.emit(f"Alert Error: {response.text}")
+                return
+            logger.info("Alert sent, HTTP %d", response.status_code)
+
+        except Exception as e:
+            logger.error("Alert sending error: %s", e)
+            self.errorOccurred.emit(f"Alert Error: {str(e)}")
+
 class NoiseMonitorWindow(QMainWindow):
     """Main window for the Noise Monitor application."""
     
     def __init__(self):
         super().__init__()
-        self.settings_manager = SettingsManager()
+        self.settings_manager = get_settings()
         self.is_monitoring = True
-        self.last_alert_time = 0
-        self.recording_thread: Optional[threading.Thread] = None
         self.noise_levels = []
         self.max_level = 0
         self.min_level = 120
         self.current_db = 0
         self.max_level_time: Optional[datetime.datetime] = None
         self.min_level_time: Optional[datetime.datetime] = None
+        self._tray_icons: dict = {}  # (int dB, above threshold) -> QIcon
+        self._tray_key: Optional[Tuple[int, bool]] = None  # Key of the icon and tooltip last shown
+        self._level_text = ""  # Text last shown in noise_label, to skip redundant repaints
+        self._info_texts: dict = {}  # Info panel QLabel -> text last set
+        self._quitting = False  # Set by the tray Quit action; otherwise closing only hides
+        self.audio_worker = AudioWorker()
+        self.load_settings_cache()
         self.setup_ui()
+        self.setup_worker()
         self.setup_tray()
         self.setup_audio()
         self.apply_theme()
         self.start_monitoring()
 
-        if self.settings_manager.get("start_minimized", False, type=bool):
+        if self._cfg["start_minimized"]:
             self.hide()
 
+    def load_settings_cache(self) -> None:
+        """Snapshot all settings into a dict; QSettings hits the registry per call."""
+        self._cfg = self.settings_manager.as_dict()
+        self.audio_worker.cfg = self._cfg
+        self.audio_worker.set_telegram(self._cfg["telegram_token"], self._cfg["telegram_chat_id"])
+
+    def setup_worker(self) -> None:
+        """Send alerts on a small thread pool so encoding and network I/O never block the UI."""
+        self._alert_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='alert')
+        self.audio_worker.errorOccurred.connect(self.status_label.setText)
+        QApplication.instance().aboutToQuit.connect(self.stop_worker)
+
+    def stop_worker(self) -> None:
+        """Stop capture, drop alerts that have not started sending and close the HTTP session."""
+        self.audio_worker.close_stream()
+        self._alert_pool.shutdown(wait=False, cancel_futures=True)
+        self.audio_worker.http.close()
+
     def setup_ui(self) -> None:
         """Setup the main window UI."""
         self.setWindowTitle(APP_NAME)
         self.setMinimumSize(320, 240)
-        self.setWindowIcon(qta.icon('fa5s.volume-up'))
+        self.setWindowIcon(_cached_icon('fa5s.volume-up'))
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -474,7 +851,7 @@ class NoiseMonitorWindow(QMainWindow):
         self.noise_label.setAlignment(Qt.AlignCenter)
         level_layout.addWidget(self.noise_label)
 
-        self.unit_label = QLabel("dB SPL")
+        self.unit_label = QLabel("dB(A)")
         self.unit_label.setFont(QFont("Segoe UI", 12))
         level_layout.addWidget(self.unit_label)
         status_layout.addLayout(level_layout)
@@ -484,7 +861,7 @@ class NoiseMonitorWindow(QMainWindow):
         stats_grid.setSpacing(4)
 
         self.min_icon = QLabel()
-        self.min_icon.setPixmap(qta.icon('fa5s.arrow-down', color='#4CAF50').pixmap(ICON_SIZE))
+        self.min_icon.setPixmap(_cached_icon('fa5s.arrow-down', color='#4CAF50').pixmap(ICON_SIZE))
         stats_grid.addWidget(self.min_icon, 0, 0, Qt.AlignCenter)
 
         self.min_label = QLabel("Min: -- dB")
@@ -497,7 +874,7 @@ class NoiseMonitorWindow(QMainWindow):
         stats_grid.addWidget(self.min_time_label, 0, 2)
 
         self.max_icon = QLabel()
-        self.max_icon.setPixmap(qta.icon('fa5s.arrow-up', color='#F44336').pixmap(ICON_SIZE))
+        self.max_icon.setPixmap(_cached_icon('fa5s.arrow-up', color='#F44336').pixmap(ICON_SIZE))
         stats_grid.addWidget(self.max_icon, 1, 0, Qt.AlignCenter)
 
         self.max_label = QLabel("Max: -- dB")
@@ -527,15 +904,15 @@ class NoiseMonitorWindow(QMainWindow):
         info_layout.addWidget(self.device_label, 1, 0, 1, 2)
 
         threshold_icon = QLabel()
-        threshold_icon.setPixmap(qta.icon('fa5s.volume-up').pixmap(ICON_SIZE))
+        threshold_icon.setPixmap(_cached_icon('fa5s.volume-up').pixmap(ICON_SIZE))
         info_layout.addWidget(threshold_icon, 2, 0)
 
-        self.threshold_label = QLabel(f"Threshold: {self.settings_manager.get('threshold', DEFAULT_THRESHOLD)} dB")
+        self.threshold_label = QLabel(_THRESHOLD_TEXT(self._cfg['threshold']))
         self.threshold_label.setFont(QFont("Segoe UI", 10))
         info_layout.addWidget(self.threshold_label, 2, 1)
 
         filter_icon = QLabel()
-        filter_icon.setPixmap(qta.icon('fa5s.filter').pixmap(ICON_SIZE))
+        filter_icon.setPixmap(_cached_icon('fa5s.filter').pixmap(ICON_SIZE))
         info_layout.addWidget(filter_icon, 3, 0)
 
         self.filter_label = QLabel("Spike Filter: Enabled")
@@ -549,9 +926,11 @@ class NoiseMonitorWindow(QMainWindow):
         control_layout.setSpacing(8)
 
         self.status_icon = QLabel()
-        self.status_icon_active = qta.icon('fa5s.broadcast-tower', color='#4CAF50')
-        self.status_icon_paused = qta.icon('fa5s.pause-circle', color='#F44336')
-        self.status_icon.setPixmap(self.status_icon_active.pixmap(ICON_SIZE))
+        self.status_icon_active = _cached_icon('fa5s.broadcast-tower', color='#4CAF50')
+        self.status_icon_paused = _cached_icon('fa5s.pause-circle', color='#F44336')
+        self._pix_active = self.status_icon_active.pixmap(ICON_SIZE)
+        self._pix_paused = self.status_icon_paused.pixmap(ICON_SIZE)
+        self.status_icon.setPixmap(self._pix_active)
         control_layout.addWidget(self.status_icon)
 
         self.status_label = QLabel("Monitoring...")
@@ -559,13 +938,15 @@ class NoiseMonitorWindow(QMainWindow):
         control_layout.addWidget(self.status_label)
         control_layout.addStretch()
 
-        self.toggle_button = QPushButton(qta.icon('fa5s.pause'), "")
+        self._icon_play = _cached_icon('fa5s.play')
+        self._icon_pause = _cached_icon('fa5s.pause')
+        self.toggle_button = QPushButton(self._icon_pause, "")
         self.toggle_button.setToolTip("Pause Monitoring")
         self.toggle_button.setFixedSize(28, 28)
         self.toggle_button.clicked.connect(self.toggle_monitoring)
         control_layout.addWidget(self.toggle_button)
 
-        settings_button = QPushButton(qta.icon('fa5s.cog'), "")
+        settings_button = QPushButton(_cached_icon('fa5s.cog'), "")
         settings_button.setToolTip("Settings")
         settings_button.setFixedSize(28, 28)
         settings_button.clicked.connect(self.show_settings)
@@ -575,7 +956,7 @@ class NoiseMonitorWindow(QMainWindow):
 
     def apply_theme(self) -> None:
         """Apply the selected theme to the window."""
-        self.setStyleSheet(ThemeManager.get_stylesheet(self.settings_manager.get("theme", "System")))
+        self.setStyleSheet(ThemeManager.get_stylesheet(self._cfg["theme"]))
         # Animate theme transition
         # Fade in animation
         animation = QPropertyAnimation(self, b"windowOpacity")
@@ -584,9 +965,31 @@ class NoiseMonitorWindow(QMainWindow):
         animation.setEndValue(1.0)
         animation.start()
 
+    def filter_status_text(self) -> str:
+        """Describe the active alert filter for the info panel."""
+        if self._cfg['spectral_filter']:
+            return f"Spike Filter: Spectral ({SPECTRAL_BAND[0]}-{SPECTRAL_BAND[1]} Hz)"
+        return f"Spike Filter: {'Enabled' if self._cfg['filter_micro_lags'] else 'Disabled'}"
+
+    def update_info_labels(self) -> None:
+        """Refresh the settings-derived info labels, skipping any whose text is unchanged."""
+        for label, text in (
+            (self.device_label, _DEVICE_TEXT(self.device_name or 'Not selected')),
+            (self.threshold_label, _THRESHOLD_TEXT(self._cfg['threshold'])),
+            (self.filter_label, self.filter_status_text()),
+        ):
+            if self._info_texts.get(label) != text:
+                self._info_texts[label] = text
+                label.setText(text)
+
     def setup_tray(self) -> None:
         """Setup the system tray icon and menu."""
         try:
+            self._tray_font = QFont("Arial")
+            self._tray_font.setPixelSize(10)
+            self._tray_font_small = QFont("Arial")
+            self._tray_font_small.setPixelSize(8)  # Three-digit levels
+
             self.tray_icon = QSystemTrayIcon(self)
             self.update_tray_icon(0)
             self.tray_icon.setToolTip(APP_NAME)
@@ -601,7 +1004,7 @@ class NoiseMonitorWindow(QMainWindow):
             tray_menu.addAction(self.pause_action)
 
             quit_action = QAction("Quit", self)
-            quit_action.triggered.connect(QApplication.quit)
+            quit_action.triggered.connect(self.quit_app)
             tray_menu.addAction(quit_action)
 
             self.tray_icon.setContextMenu(tray_menu)
@@ -609,7 +1012,7 @@ class NoiseMonitorWindow(QMainWindow):
             self.tray_icon.show()
 
         except Exception as e:
-            logger.error(f"Failed to setup system tray: {e}")
+            logger.error("Failed to setup system tray: %s", e)
             QMessageBox.warning(self, "Tray Icon Error", f"Could not create system tray icon: {str(e)}")
 
     def _tray_icon_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
@@ -621,8 +1024,8 @@ class NoiseMonitorWindow(QMainWindow):
 
     def setup_audio(self) -> None:
         """Setup audio device configuration."""
-        self.device_name = self.settings_manager.get("audio_device", "")
-        devices = sd.query_devices()
+        self.device_name = self._cfg["audio_device"]
+        devices = query_devices_cached()
         self.device_id = None
 
         for i, device in enumerate(devices):
@@ -635,204 +1038,141 @@ class NoiseMonitorWindow(QMainWindow):
             if self.device_id is not None:
                 self.device_name = devices[self.device_id]['name']
 
-        self.device_label.setText(f"Device: {self.device_name or 'Not selected'}")
-        self.filter_label.setText(f"Spike Filter: {'Enabled' if self.settings_manager.get('filter_micro_lags', True, type=bool) else 'Disabled'}")
+        self.update_info_labels()
+        self.audio_worker.set_alert_details(self.device_name, self._cfg['threshold'])
+        self.audio_worker.open_stream(self.device_id)
 
     def update_tray_icon(self, db_level: float) -> None:
         """Update the system tray icon with current dB level."""
-        from PIL import Image, ImageDraw, ImageFont
-        import io
-
-        img = Image.new('RGBA', (16, 16), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-
-        try:
-            font_size = 10 if db_level < 100 else 8
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-
-        text = f"{int(db_level)}"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        x = (16 - text_width) // 2
-        y = (16 - text_height) // 2
-
-        threshold = self.settings_manager.get("threshold", DEFAULT_THRESHOLD, type=int)
-        text_color = (255, 80, 80, 255) if db_level > threshold else (80, 255, 80, 255)
-        draw.text((x, y), text, font=font, fill=text_color)
-
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        from PySide6.QtGui import QImage, QPixmap
-        qimg = QImage.fromData(buffer.getvalue())
-        pixmap = QPixmap.fromImage(qimg)
-        icon = QIcon(pixmap)
+        key = (int(db_level), db_level > self._cfg['threshold'])
+        if key == self._tray_key:
+            return  # Each setter is a Shell_NotifyIcon call even when nothing changed
+        icon = self._tray_icons.get(key)
+        if icon is None:
+            icon = self._tray_icons[key] = self._render_tray_icon(*key)
 
         if self.tray_icon:
+            self._tray_key = key
             self.tray_icon.setIcon(icon)
-            self.tray_icon.setToolTip(f'{APP_NAME}\nCurrent Level: {db_level:.1f} dB')
+            self.tray_icon.setToolTip(f'{APP_NAME}\nCurrent Level: {key[0]} dB')
+
+    def _render_tray_icon(self, db: int, is_alert: bool) -> QIcon:
+        """Render a dB value as a 16x16 tray icon."""
+        pixmap = QPixmap(16, 16)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setFont(self._tray_font if db < 100 else self._tray_font_small)
+        painter.setPen(QColor(255, 80, 80) if is_alert else QColor(80, 255, 80))
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, f"{db}")
+        painter.end()
+        return QIcon(pixmap)
 
     def start_monitoring(self) -> None:
         """Start the noise monitoring timer."""
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_noise_level)
-        self.update_timer.start(5000)  # Update every 5 seconds
+        self.update_timer.start(UI_REFRESH_MS)
 
     def update_noise_level(self) -> None:
-        """Update the noise level by recording audio."""
-        if not self.is_monitoring or self.device_id is None:
-            return
-
-        if self.recording_thread is None or not self.recording_thread.is_alive():
-            self.recording_thread = threading.Thread(target=self.record_audio)
-            self.recording_thread.start()
-
-    def record_audio(self) -> None:
-        """Record and process audio data."""
-        try:
-            duration = 10
-            samples = int(duration * SAMPLE_RATE)
-            recording = sd.rec(
-                samples,
-                samplerate=SAMPLE_RATE,
-                channels=1,
-                dtype='float32',
-                device=self.device_id,
-                blocking=True
-            )
-
-            chunk_size = int(SAMPLE_RATE * CHUNK_DURATION)
-            chunks = np.array_split(recording, len(recording) // chunk_size)
-            db_levels = []
-
-            for chunk in chunks:
-                rms = np.sqrt(np.mean(chunk**2))
-                if rms > 0:
-                    db = 20 * np.log10(rms) + 90  # Convert to SPL
-                    db_levels.append(db)
-
-            if db_levels:
-                avg_db = np.mean(db_levels)
-                max_db = np.max(db_levels)
-                min_db = np.min(db_levels)
-                current_time = datetime.datetime.now()
-
-                if max_db > self.max_level:
-                    self.max_level = max_db
-                    self.max_level_time = current_time
-                if min_db < self.min_level:
-                    self.min_level = min_db
-                    self.min_level_time = current_time
-
-                self.noise_label.setText(f"{avg_db:.1f}")
-                self.min_label.setText(f"Min: {self.min_level:.1f} dB")
-                self.max_label.setText(f"Max: {self.max_level:.1f} dB")
-                self.min_time_label.setText(self.min_level_time.strftime("%H:%M:%S") if self.min_level_time else "")
-                self.max_time_label.setText(self.max_level_time.strftime("%H:%M:%S") if self.max_level_time else "")
-
-                self.current_db = avg_db
-                if self.tray_icon:
-                    self.update_tray_icon(avg_db)
-
-                threshold = self.settings_manager.get("threshold", DEFAULT_THRESHOLD, type=int)
-                current_time = time.time()
-
-                should_alert = False
-                if self.settings_manager.get("filter_micro_lags", True, type=bool):
-                    spike_duration_ms = self.settings_manager.get("spike_duration_ms", DEFAULT_SPIKE_DURATION, type=int)
-                    required_chunks = int(spike_duration_ms / (CHUNK_DURATION * 1000))
-                    high_chunks = sum(1 for db in db_levels if db > threshold)
-                    should_alert = high_chunks >= required_chunks
-                else:
-                    should_alert = max_db > threshold
-
-                if should_alert and (current_time - self.last_alert_time) >= ALERT_COOLDOWN:
-                    self.send_alert(avg_db, max_db, min_db, recording)
-                    self.last_alert_time = current_time
-
-        except Exception as e:
-            logger.error(f"Recording error: {e}")
-            self.status_label.setText(f"Error: {str(e)}")
-
-    def send_alert(self, avg_db: float, max_db: float, min_db: float, recording: np.ndarray) -> None:
-        """Send a Telegram alert with audio recording."""
-        try:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            wav_path = f"noise_alert_{timestamp}.wav"
-            ogg_path = wav_path.replace('.wav', '.ogg')
-
-            sf.write(wav_path, recording, SAMPLE_RATE)
-            data, samplerate = sf.read(wav_path)
-            sf.write(ogg_path, data, samplerate)
-
-            token = self.settings_manager.get("telegram_token", "")
-            chat_id = self.settings_manager.get("telegram_chat_id", "")
-
-            if token and chat_id:
-                message = f"""
-🚨 *NOISE ALERT* 🚨
-
-📊 *Noise Levels (10s sample):*
-• Average: {avg_db:.1f} dB SPL
-• Maximum: {max_db:.1f} dB SPL
-• Minimum: {min_db:.1f} dB SPL
-
-⏰ Time: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-📍 *Alert Details:*
-• Threshold: {self.settings_manager.get('threshold', DEFAULT_THRESHOLD)} dB SPL
-• Device: {self.device_name}
-"""
-                requests.post(
-                    f"https://api.telegram.org/bot{token}/sendMessage",
-                    data={"chat_id": chat_id, "text": message, "parse_mode": "Markdown"}
-                )
-
-                with open(ogg_path, 'rb') as audio:
-                    requests.post(
-                        f"https://api.telegram.org/bot{token}/sendAudio",
-                        data={"chat_id": chat_id},
-                        files={"audio": audio}
-                    )
+        """Hand queued alerts to the alert pool and show the latest levels."""
+        # Drain even while paused: an alert raised just before pausing must still go out
+        while True:
+            try:
+                alert = self.audio_worker.alerts.get_nowait()
+            except queue.Empty:
+                break
+            logger.info("Alert queued: avg %.1f, max %.1f, min %.1f dB(A)", *alert[:3])
+            # The recording is a pooled buffer this alert keeps until the next one, so no copy
+            self._alert_pool.submit(self.audio_worker.send_alert, *alert)
 
-            os.remove(wav_path)
-            os.remove(ogg_path)
+        if not self.is_monitoring:
+            return
+        levels = self.audio_worker.read_levels()
+        if levels is not None:
+            self.show_levels(*levels)
+
+    def show_levels(self, level_db: float, max_db: float, min_db: float) -> None:
+        """Display the smoothed level and any new extremes."""
+        new_max = max_db > self.max_level
+        new_min = min_db < self.min_level
+        level_text = _LEVEL_TEXT(level_db)
+        if new_max or new_min or level_text != self._level_text:
+            # Batch the label changes into a single repaint of the window
+            central = self.centralWidget()
+            central.setUpdatesEnabled(False)
+
+            # Min/max labels only change with a new extreme, so only then format them
+            if new_max:
+                self.max_level = max_db
+                self.max_level_time = datetime.datetime.now()
+                self.max_time_label.setText(self.max_level_time.strftime("%H:%M:%S"))
+                self.max_label.setText(_MAX_TEXT(max_db))
+            if new_min:
+                self.min_level = min_db
+                self.min_level_time = datetime.datetime.now()
+                self.min_time_label.setText(self.min_level_time.strftime("%H:%M:%S"))
+                self.min_label.setText(_MIN_TEXT(min_db))
+            if level_text != self._level_text:
+                self._level_text = level_text
+                self.noise_label.setText(level_text)
+
+            central.setUpdatesEnabled(True)  # Re-enabling schedules the repaint
+
+        self.current_db = level_db
+        if self.tray_icon:
+            self.update_tray_icon(level_db)
 
-        except Exception as e:
-            logger.error(f"Alert sending error: {e}")
-            self.status_label.setText(f"Alert Error: {str(e)}")
 
     def toggle_monitoring(self) -> None:
         """Toggle monitoring state."""
-        self.is_monitoring = not self.is_monitoring
-        self.toggle_button.setIcon(qta.icon('fa5s.play' if not self.is_monitoring else 'fa5s.pause'))
-        self.toggle_button.setToolTip("Resume Monitoring" if not self.is_monitoring else "Pause Monitoring")
-        self.status_label.setText("Paused" if not self.is_monitoring else "Monitoring...")
-        self.status_icon.setPixmap(
-            self.status_icon_paused.pixmap(ICON_SIZE) if not self.is_monitoring else
-            self.status_icon_active.pixmap(ICON_SIZE)
-        )
-        self.pause_action.setText("Resume" if not self.is_monitoring else "Pause")
+        self.set_monitoring(not self.is_monitoring)
+
+    def set_monitoring(self, enabled: bool) -> None:
+        """Pause or resume monitoring; a no-op if already in that state."""
+        if enabled == self.is_monitoring:
+            return
+        self.is_monitoring = enabled
+        self.audio_worker.monitoring = enabled
+        self.toggle_button.setIcon(self._icon_pause if enabled else self._icon_play)
+        self.toggle_button.setToolTip("Pause Monitoring" if enabled else "Resume Monitoring")
+        self.status_label.setText("Monitoring..." if enabled else "Paused")
+        self.status_icon.setPixmap(self._pix_active if enabled else self._pix_paused)
+        self.pause_action.setText("Pause" if enabled else "Resume")
 
     def show_settings(self) -> None:
         """Show the settings dialog."""
         dialog = SettingsDialog(self)
+        dialog.settingsChanged.connect(self.load_settings_cache)
         if dialog.exec():
-            self.setup_audio()
-            self.threshold_label.setText(f"Threshold: {self.settings_manager.get('threshold', DEFAULT_THRESHOLD)} dB")
-            self.filter_label.setText(
-                f"Spike Filter: {'Enabled' if self.settings_manager.get('filter_micro_lags', True, type=bool) else 'Disabled'}"
-            )
+            self.setup_audio()  # Also refreshes the info labels
+
+    def quit_app(self) -> None:
+        """Really quit, as opposed to closing the window to the tray."""
+        self._quitting = True
+        self.close()
 
     def closeEvent(self, event) -> None:
-        """Handle window close event."""
-        event.ignore()
-        self.hide()
+        """Hide to the tray, or tear down background resources when quitting."""
+        if not self._quitting:
+            event.ignore()
+            self.hide()
+            return
+
+        self.stop_worker()
+        if self.tray_icon:
+            self.tray_icon.hide()
+        event.accept()
+        QApplication.quit()
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument('--verbose', action='store_true', help="Log informational messages")
+    args, qt_args = parser.parse_known_args()
+    if args.verbose:
+        logger.setLevel(logging.INFO)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
     window = NoiseMonitorWindow()
     sys.exit(app.exec())
\ No newline at end of file